@@ -34,6 +34,8 @@ Usage: $(basename "$0") <options>
     -i, --install-only       Just install the cr tool
     -s, --skip-packaging     Skip the packaging step (run your own packaging before using the releaser)
     -u, --skip-update-index  Skip update index step
+    -p, --package-concurrency
+                             The number of charts to package in parallel (default: 1)
 EOF
 }
 
@@ -47,13 +49,15 @@ main() {
     local install_only=
     local skip_packaging=
     local skip_update_index=
+    local package_concurrency=1
 
     parse_command_line "$@"
 
     : "${CR_TOKEN:?Environment variable CR_TOKEN must be set}"
 
-    local repo_root
-    repo_root=$(git rev-parse --show-toplevel)
+    local rev_parse repo_root head_sha
+    rev_parse=$(git rev-parse --show-toplevel HEAD)
+    { read -r repo_root; read -r head_sha; } <<< "$rev_parse"
     pushd "$repo_root" > /dev/null
 
     if ! [[ -n "$skip_packaging" ]]; then
@@ -68,19 +72,9 @@ main() {
         if [[ -n "${changed_charts[*]}" ]]; then
             install_chart_releaser
 
-            rm -rf .cr-release-packages
-            mkdir -p .cr-release-packages
+            reset_dirs .cr-release-packages .cr-index
 
-            rm -rf .cr-index
-            mkdir -p .cr-index
-
-            for chart in "${changed_charts[@]}"; do
-                if [[ -d "$chart" ]]; then
-                    package_chart "$chart"
-                else
-                    echo "Chart '$chart' no longer exists in repo. Skipping it..."
-                fi
-            done
+            package_charts "${changed_charts[@]}"
 
             release_charts
             if [ -z "$skip_update_index" ]; then
@@ -91,8 +85,7 @@ main() {
         fi
     else
         install_chart_releaser
-        rm -rf .cr-index
-        mkdir -p .cr-index
+        reset_dirs .cr-index
         release_charts
         if [ -z "$skip_update_index" ]; then
           update_index
@@ -183,6 +176,12 @@ parse_command_line() {
                     shift
                 fi
                 ;;
+            -p|--package-concurrency)
+                if [[ -n "${2:-}" ]]; then
+                    package_concurrency="$2"
+                    shift
+                fi
+                ;;
             *)
                 break
                 ;;
@@ -203,10 +202,16 @@ parse_command_line() {
         exit 1
     fi
 
-    if [[ -z "$install_dir" ]]; then
-        local arch
-        arch=$(uname -m)
-        install_dir="$RUNNER_TOOL_CACHE/cr/$version/$arch"
+    if ! [[ "$package_concurrency" =~ ^[1-9][0-9]*$ ]]; then
+        echo "ERROR: '-p|--package-concurrency' must be a positive integer." >&2
+        show_help
+        exit 1
+    fi
+
+    # Parallel packaging reaps jobs with 'wait -n -p', which needs bash 5.1 or later.
+    if (( package_concurrency > 1 )) && (( BASH_VERSINFO[0] * 100 + BASH_VERSINFO[1] < 501 )); then
+        echo "ERROR: '-p|--package-concurrency' greater than 1 requires bash 5.1 or later (found $BASH_VERSION)." >&2
+        exit 1
     fi
 
     if [[ -n "$install_only" ]]; then
@@ -222,13 +227,27 @@ install_chart_releaser() {
         exit 1
     fi
 
-    if [[ ! -d "$install_dir" ]]; then
+    if [[ -z "$install_dir" ]]; then
+        install_dir="$RUNNER_TOOL_CACHE/cr/$version/$HOSTTYPE"
+    fi
+
+    if [[ ! -x "$install_dir/cr" ]]; then
         mkdir -p "$install_dir"
 
+        # Unpack into a staging directory inside the install dir so that a failed
+        # download never leaves a partial 'cr' behind that later runs would trust,
+        # and remove it again if the script exits before the install completes.
+        local staging_dir cleanup
+        staging_dir=$(mktemp -d "$install_dir/.cr-install.XXXXXX")
+        printf -v cleanup 'rm -rf %q' "$staging_dir"
+        trap "$cleanup" EXIT
+
         echo "Installing chart-releaser on $install_dir..."
-        curl -sSLo cr.tar.gz "https://github.com/helm/chart-releaser/releases/download/$version/chart-releaser_${version#v}_linux_amd64.tar.gz"
-        tar -xzf cr.tar.gz -C "$install_dir"
-        rm -f cr.tar.gz
+        curl -sSfL "https://github.com/helm/chart-releaser/releases/download/$version/chart-releaser_${version#v}_linux_amd64.tar.gz" \
+            | tar -xz -C "$staging_dir"
+        mv -f "$staging_dir"/* "$install_dir"
+        rm -rf "$staging_dir"
+        trap - EXIT
     fi
 
     echo 'Adding cr directory to PATH...'
@@ -236,7 +255,7 @@ install_chart_releaser() {
 }
 
 lookup_latest_tag() {
-    git fetch --tags > /dev/null 2>&1
+    git fetch --tags --no-recurse-submodules > /dev/null 2>&1
 
     if ! git describe --tags --abbrev=0 2> /dev/null; then
         git rev-list --max-parents=0 --first-parent HEAD
@@ -245,11 +264,10 @@ lookup_latest_tag() {
 
 filter_charts() {
     while read -r chart; do
-        [[ ! -d "$chart" ]] && continue
         local file="$chart/Chart.yaml"
         if [[ -f "$file" ]]; then
             echo "$chart"
-        else
+        elif [[ -d "$chart" ]]; then
            echo "WARNING: $file is missing, assuming that '$chart' is not a Helm chart. Skipping." 1>&2
         fi
     done
@@ -258,13 +276,20 @@ filter_charts() {
 lookup_changed_charts() {
     local commit="$1"
 
-    local changed_files
-    changed_files=$(git diff --find-renames --name-only "$commit" -- "$charts_dir")
-
-    local depth=$(( $(tr "/" "\n" <<< "$charts_dir" | sed '/^\(\.\)*$/d' | wc -l) + 1 ))
+    local depth=1 part parts
+    IFS='/' read -ra parts <<< "$charts_dir"
+    for part in "${parts[@]}"; do
+        [[ "$part" =~ ^\.*$ ]] || (( depth++ ))
+    done
     local fields="1-${depth}"
 
-    cut -d '/' -f "$fields" <<< "$changed_files" | uniq | filter_charts
+    git diff --find-renames --name-only "$commit" -- "$charts_dir" \
+        | cut -d '/' -f "$fields" | uniq | filter_charts
+}
+
+reset_dirs() {
+    rm -rf "$@"
+    mkdir "$@"
 }
 
 package_chart() {
@@ -279,8 +304,63 @@ package_chart() {
     cr package "${args[@]}"
 }
 
+package_charts() {
+    local chart
+
+    if (( package_concurrency == 1 )); then
+        for chart in "$@"; do
+            package_chart "$chart"
+        done
+        return
+    fi
+
+    # Each job gets its own process group so a failure can stop the cr processes of the
+    # others, and its own log file so that output is printed per chart, not interleaved.
+    set -m
+    local log_dir
+    log_dir=$(mktemp -d)
+    local -A logs=()
+    local i=0
+
+    for chart in "$@"; do
+        if (( ${#logs[@]} >= package_concurrency )); then
+            wait_for_package_job
+        fi
+        package_chart "$chart" > "$log_dir/$i" 2>&1 &
+        logs[$!]="$log_dir/$i"
+        i=$(( i + 1 ))
+    done
+
+    while (( ${#logs[@]} > 0 )); do
+        wait_for_package_job
+    done
+
+    rm -rf "$log_dir"
+    set +m
+}
+
+# Reaps one job started by package_charts, using and updating its 'logs' and 'log_dir' locals.
+wait_for_package_job() {
+    local pid status=0
+    wait -n -p pid "${!logs[@]}" || status=$?
+    cat "${logs[$pid]}"
+    unset "logs[$pid]"
+
+    if (( status != 0 )); then
+        # The jobs already have their own process groups; turning job control off
+        # keeps bash from printing 'Terminated' status lines for them.
+        set +m
+        for pid in "${!logs[@]}"; do
+            kill -- "-$pid" 2> /dev/null || true
+        done
+        wait 2> /dev/null
+        rm -rf "$log_dir"
+        exit "$status"
+    fi
+}
+
 release_charts() {
-    local args=(-o "$owner" -r "$repo" -c "$(git rev-parse HEAD)")
+    local args=(-o "$owner" -r "$repo" -c "$head_sha")
     if [[ -n "$config" ]]; then
         args+=(--config "$config")
     fi